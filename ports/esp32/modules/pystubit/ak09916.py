@@ -97,11 +97,7 @@ class AK09916(ICMRegisterRW):
         X, Y, Z axis micro-Tesla (uT) as floats.
         """
         # self.register_char(_CNTL2, MODE_SINGLE_MEASURE)
-        # xyz = list(self.register_three_shorts(_HXL, endian='l'))
-        x = self.register_short(_HXL, endian='l')
-        y = self.register_short(_HYL, endian='l')
-        z = self.register_short(_HZL, endian='l')
-        xyz = [x, y, z]
+        xyz = list(self.register_three_shorts(_HXL, endian='l'))
 
         self.register_char(_ST2)    # Enable updating readings again
 
@@ -25,6 +25,7 @@ We used the script below as reference
 https://github.com/loboris/MicroPython_ESP32_psRAM_LoBo/blob/master/MicroPython_BUILD/components/micropython/esp32/modules_examples/drivers/mpu9250.py
 ------------------------------------------------------------------------------
 """
+import ustruct
 from micropython import const
 from .ak09916 import AK09916
 from .icm_register_rw import ICMRegisterRW
@@ -218,6 +219,30 @@ class ICM20948(ICMRegisterRW):
         """
         return self._ak09916.magnetic
 
+    def read_accel_gyro(self, buf=bytearray(12)):
+        """
+        Acceleration and gyro readings as a 6-tuple
+        (ax, ay, az, gx, gy, gz). The registers are contiguous and
+        fetched in a single burst.
+        """
+        self._i2c.readfrom_mem_into(self._address, _ACCEL_XOUT_H, buf)
+        ax, ay, az, gx, gy, gz = ustruct.unpack(">hhhhhh", buf)
+
+        aso = self._accel_so
+        asf = self._accel_sf
+        gso = self._gyro_so
+        gsf = self._gyro_sf
+
+        return (ax / aso * asf, ay / aso * asf, az / aso * asf,
+                gx / gso * gsf, gy / gso * gsf, gz / gso * gsf)
+
+    def read_all_axes(self):
+        """
+        Acceleration, gyro and magnetic readings as a 9-tuple
+        (ax, ay, az, gx, gy, gz, mx, my, mz).
+        """
+        return self.read_accel_gyro() + self._ak09916.magnetic
+
     @property
     def whoami(self):
         """ Value of the whoami register. """
@@ -24,10 +24,8 @@ We used the script below as reference
 ------------------------------------------------------------------------------
 """
 from micropython import const
-from time import sleep_ms
-from math import atan, sin, cos, pi, log
-import io
-import json
+from time import sleep_ms, ticks_ms, ticks_diff
+from math import atan, atan2, copysign, sin, cos, pi, log
 from .const import *
 from .terminal import StuduinoBitAnalogPin
 
@@ -35,50 +33,109 @@ from .terminal import StuduinoBitAnalogPin
 MAGNETIC_OFFSET = 'magnetic_offset'
 MAGNETIC_SCALE = 'magnetic_scale'
 
-# for singleton pattern
-# Implement used global value,
-# maybe Micropython 'function' object can't have attribute...
-__icm20948 = None
+_RAD2DEG = 180.0 / pi
 
+# CONFIG_FILE contents, parsed once and written back by _flush_config()
+# whenever _set_configureValues() changes them
+_config_cache = None
+
+
+def _load_config():
+    global _config_cache
+
+    if _config_cache is None:
+        import io
+        import ujson
+        try:
+            with io.open(CONFIG_FILE, mode='r') as f:
+                _config_cache = ujson.load(f)
+        except (OSError, ValueError):
+            pass
+        if not isinstance(_config_cache, dict):
+            _config_cache = {}
+    return _config_cache
+
+
+def _flush_config():
+    import io
+    import ujson
+    with io.open(CONFIG_FILE, mode='w') as f:
+        ujson.dump(_load_config(), f)
 
-def get_icm20948_object():
-    global __icm20948
 
+# for singleton pattern, shared instances keyed by class
+_singletons = {}
+
+
+def _get_singleton(cls, *args):
+    obj = _singletons.get(cls)
+    if obj is None:
+        _singletons[cls] = obj = cls(*args)
+    return obj
+
+
+def get_icm20948_object():
     from .icm20948 import ICM20948
     from .bus import get_i2c_object
+    return _get_singleton(ICM20948, get_i2c_object())
 
-    if __icm20948 is None:
-        __icm20948 = ICM20948(get_i2c_object())
-    return __icm20948
 
+# last ICM20948 readings, shared by every sensor object for 1 ms
+_accel_gyro = None
+_accel_gyro_ms = 0
+_magnetic = None
+_magnetic_ms = 0
 
-class StuduinoBitAccelerometer:
-    def __init__(self, fs='2g', sf='ms2'):
-        # from .icm20948 import ICM20948
+
+class _ICM20948Sensor:
+    def __init__(self):
         self._icm20948 = get_icm20948_object()
+
+    def _refresh(self):
+        # (ax, ay, az, gx, gy, gz) from one 12-byte burst
+        global _accel_gyro, _accel_gyro_ms
+
+        now = ticks_ms()
+        if _accel_gyro is None or ticks_diff(now, _accel_gyro_ms) > 1:
+            _accel_gyro = self._icm20948.read_accel_gyro()
+            _accel_gyro_ms = now
+        return _accel_gyro
+
+    def _refresh_magnetic(self):
+        # (mx, my, mz), read without touching the accel/gyro registers
+        global _magnetic, _magnetic_ms
+
+        now = ticks_ms()
+        if _magnetic is None or ticks_diff(now, _magnetic_ms) > 1:
+            _magnetic = self._icm20948.magnetic
+            _magnetic_ms = now
+        return _magnetic
+
+
+class StuduinoBitAccelerometer(_ICM20948Sensor):
+    _AXIS_MAP = {'sbmp': (1, 1, 1), 'mb': (1, 1, 1), 'sbs': (-1, 1, -1)}
+
+    def __init__(self, fs='2g', sf='ms2'):
+        super().__init__()
         self._icm20948.accel_fs(fs)
         self._icm20948.accel_sf(sf)
-        self._axis_correct = (1, 1, 1)
+        self.set_axis('sbmp')
 
     def get_x(self, ndigits=2):
-        return round(self._icm20948.acceleration[0] *
-                     self._axis_correct[0], ndigits)
+        return round(self._refresh()[0] * self._cx, ndigits)
 
     def get_y(self, ndigits=2):
-        return round(self._icm20948.acceleration[1] *
-                     self._axis_correct[1], ndigits)
+        return round(self._refresh()[1] * self._cy, ndigits)
 
     def get_z(self, ndigits=2):
-        return round(self._icm20948.acceleration[2] *
-                     self._axis_correct[2], ndigits)
+        return round(self._refresh()[2] * self._cz, ndigits)
 
     def get_values(self, ndigits=2):
-        value = self._icm20948.acceleration
-
-        x = round(value[0] * self._axis_correct[0], ndigits)
-        y = round(value[1] * self._axis_correct[1], ndigits)
-        z = round(value[2] * self._axis_correct[2], ndigits)
-        return (x, y, z)
+        x, y, z = self._icm20948.acceleration
+        cx, cy, cz = self._axis_correct
+        return (round(x * cx, ndigits),
+                round(y * cy, ndigits),
+                round(z * cz, ndigits))
 
     def current_gesture(self):
         raise NotImplementedError
@@ -99,43 +156,40 @@ class StuduinoBitAccelerometer:
         self._icm20948.accel_sf(value)
 
     def set_axis(self, mode):
-        if type(mode) != str:
+        if not isinstance(mode, str):
             raise TypeError("set_axis() expected 'sbmp'/'sbs'/'mb', \
 but {} found".format(type(mode)))
-        if (mode is 'sbmp') or (mode is 'mb'):
-            self._axis_correct = (1, 1, 1)
-        elif (mode is 'sbs'):
-            self._axis_correct = (-1, 1, -1)
-        else:
+        try:
+            self._axis_correct = self._AXIS_MAP[mode]
+        except KeyError:
             raise NameError("name '{}' is not defined".format(mode))
+        self._cx, self._cy, self._cz = self._axis_correct
 
 
-class StuduinoBitGyro:
-    def __init__(self, fs='250dps', sf='dps'):
-        self._icm20948 = get_icm20948_object()
+class StuduinoBitGyro(_ICM20948Sensor):
+    _AXIS_MAP = {'sbmp': (1, 1, 1), 'sbs': (-1, 1, -1)}
 
+    def __init__(self, fs='250dps', sf='dps'):
+        super().__init__()
         self._icm20948.gyro_fs(fs)
         self._icm20948.gyro_sf(sf)
-        self._axis_correct = (1, 1, 1)
+        self.set_axis('sbmp')
 
     def get_x(self, ndigits=2):
-        return round(self._icm20948.gyro[0] *
-                     self._axis_correct[0], ndigits)
+        return round(self._refresh()[3] * self._cx, ndigits)
 
     def get_y(self, ndigits=2):
-        return round(self._icm20948.gyro[1] *
-                     self._axis_correct[1], ndigits)
+        return round(self._refresh()[4] * self._cy, ndigits)
 
     def get_z(self, ndigits=2):
-        return round(self._icm20948.gyro[2] *
-                     self._axis_correct[2], ndigits)
+        return round(self._refresh()[5] * self._cz, ndigits)
 
     def get_values(self, ndigits=2):
-        value = self._icm20948.gyro
-        x = round(value[0] * self._axis_correct[0], ndigits)
-        y = round(value[1] * self._axis_correct[1], ndigits)
-        z = round(value[2] * self._axis_correct[2], ndigits)
-        return (x, y, z)
+        x, y, z = self._icm20948.gyro
+        cx, cy, cz = self._axis_correct
+        return (round(x * cx, ndigits),
+                round(y * cy, ndigits),
+                round(z * cz, ndigits))
 
     def set_fs(self, value):
         self._icm20948.gyro_fs(value)
@@ -144,20 +198,21 @@ class StuduinoBitGyro:
         self._icm20948.gyro_sf(value)
 
     def set_axis(self, mode):
-        if not (type(mode) is str):
+        if not isinstance(mode, str):
             raise TypeError("set_axis() expected 'sbmp'/'sbs', \
 but {} found".format(type(mode)))
-        if (mode is 'sbmp'):
-            self._axis_correct = (1, 1, 1)
-        elif (mode is 'sbs'):
-            self._axis_correct = (-1, 1, -1)
-        else:
+        try:
+            self._axis_correct = self._AXIS_MAP[mode]
+        except KeyError:
             raise NameError("name '{}' is not defined".format(mode))
+        self._cx, self._cy, self._cz = self._axis_correct
+
 
+class StuduinoBitCompass(_ICM20948Sensor):
+    _AXIS_MAP = {'sbmp': (1, 1, 1), 'sbs': (1, -1, -1), 'mb': (-1, -1, 1)}
 
-class StuduinoBitCompass:
     def __init__(self):
-        self._icm20948 = get_icm20948_object()
+        super().__init__()
         self._offset = self._get_configureValue(MAGNETIC_OFFSET)
         self._scale = self._get_configureValue(MAGNETIC_SCALE)
         self._calibrated = True
@@ -168,89 +223,91 @@ class StuduinoBitCompass:
         self._axis_correct = (1, 1, 1)
 
     def get_x(self):
-        return self.get_values()[0]
+        # get_x/get_y/get_z called back to back share one magnetometer read
+        return self._axis_values(self._refresh_magnetic())[0]
 
     def get_y(self):
-        return self.get_values()[1]
+        return self._axis_values(self._refresh_magnetic())[1]
 
     def get_z(self):
-        return self.get_values()[2]
+        return self._axis_values(self._refresh_magnetic())[2]
 
     def get_values(self):
-        value = self.get_pure_values()
-        x = value[0] * self._axis_correct[0]
-        y = value[1] * self._axis_correct[1]
-        z = value[2] * self._axis_correct[2]
-        return (x, y, z)
+        return self._axis_values(self._icm20948.magnetic)
+
+    def _axis_values(self, mag):
+        x, y, z = self._correct(mag)
+        cx, cy, cz = self._axis_correct
+        return (x * cx, y * cy, z * cz)
 
     def get_pure_values(self):
-        mag = self._icm20948.magnetic
-        if not self._calibrated:
-            return mag
-        else:
-            res = [0, 0, 0]
-            for i, val in enumerate(mag):
-                res[i] = (val - self._offset[i]) * self._scale[i]
-            return tuple(res)
+        return self._correct(self._icm20948.magnetic)
+
+    def _correct(self, mag):
+        # offset/scale are neutral until calibrated, so no branch is needed
+        ox, oy, oz = self._offset
+        sx, sy, sz = self._scale
+        return ((mag[0] - ox) * sx, (mag[1] - oy) * sy, (mag[2] - oz) * sz)
 
     def set_axis(self, mode):
-        if type(mode) != str:
+        if not isinstance(mode, str):
             raise TypeError("set_axis() expected 'sbmp'/'sbs'/'mb', \
 but {} found".format(type(mode)))
-        if (mode is 'sbmp'):
-            self._axis_correct = (1, 1, 1)
-        elif (mode is 'sbs'):
-            self._axis_correct = (1, -1, -1)
-        elif (mode is 'mb'):
-            self._axis_correct = (-1, -1, 1)
-        else:
+        try:
+            self._axis_correct = self._AXIS_MAP[mode]
+        except KeyError:
             raise NameError("name '{}' is not defined".format(mode))
 
     def calibrate(self):
         # Reference:
         # https://www.aichi-mi.com/home/%E9%9B%BB%E5%AD%90%E3%82%B3%E3%83%B3%E3%83%91%E3%82%B9/%E3%82%B3%E3%83%B3%E3%83%91%E3%82%B9%E3%81%AE%E8%BC%83%E6%AD%A3%E3%82%BD%E3%83%95%E3%83%88%E3%81%AE%E5%8E%9F%E7%90%86/
-        global CONFIG_FILE, MAGNETIC_OFFSET, MAGNETIC_OFFSET
-
         from .dsply import StuduinoBitDisplay
         display = StuduinoBitDisplay()
 
         self._offset = (0, 0, 0)
         self._scale = (1, 1, 1)
 
-        reading = self.get_pure_values()
-        minx = maxx = reading[0]
-        miny = maxy = reading[1]
-        minz = maxz = reading[2]
+        # offset/scale are neutral here, so raw readings are used directly
+        minx, miny, minz = self._icm20948.magnetic
+        maxx, maxy, maxz = minx, miny, minz
 
         # display.scroll('Fill Dispry with Blue')
 
         display.clear()
+        # local mirror of the display: edge pixels already sampled, and
+        # the index of the blue cursor pixel (-1 when none is lit)
+        visited = bytearray(25)
+        cursor = -1
         count = 0
-        x = 0
-        y = 0
         while True:
-            if (display.get_pixel(x, y) == (0, 0, 10)):
-                display.set_pixel(x, y, 0)
-            ax, ay, az = self._icm20948.acceleration
-            x = (ax + 8) / 4 + 0.5
-            y = (ay + 8) / 4 + 0.5
-            x = int(min(max(x, 0), 4))
-            y = int(min(max(y, 0), 4))
+            accel = self._icm20948.acceleration
+            # (a + 8) / 4 + 0.5, folded into one multiply-add
+            x = accel[0] * 0.25 + 2.5
+            y = accel[1] * 0.25 + 2.5
+            x = 0 if x < 0 else 4 if x > 4 else int(x)
+            y = 0 if y < 0 else 4 if y > 4 else int(y)
+            i = y * 5 + x
+
+            if cursor != i and cursor != -1:
+                display.set_pixel(cursor % 5, cursor // 5, 0)
+                cursor = -1
 
             if x == 0 or x == 4 or y == 0 or y == 4:
-                if display.get_pixel(x, y) == (0, 0, 0):
+                if not visited[i]:
+                    visited[i] = 1
                     display.set_pixel(x, y, 0x0a000a)
-                    reading = self.get_pure_values()
-                    minx = min(minx, reading[0])
-                    maxx = max(maxx, reading[0])
-                    miny = min(miny, reading[1])
-                    maxy = max(maxy, reading[1])
-                    minz = min(minz, reading[2])
-                    maxz = max(maxz, reading[2])
+                    rx, ry, rz = self._icm20948.magnetic
+                    minx = rx if rx < minx else minx
+                    maxx = rx if rx > maxx else maxx
+                    miny = ry if ry < miny else miny
+                    maxy = ry if ry > maxy else maxy
+                    minz = rz if rz < minz else minz
+                    maxz = rz if rz > maxz else maxz
                     display.set_pixel(x, y, 0x0a0000)
                     count += 1
-            else:
+            elif cursor != i:
                 display.set_pixel(x, y, 0x00000a)
+                cursor = i
 
             if (count == 16):
                 break
@@ -278,8 +335,8 @@ but {} found".format(type(mode)))
         self._scale = (scale_x, scale_y, scale_z)
 
         # Output config.json file
-        self._set_configureValue(MAGNETIC_OFFSET, self._offset)
-        self._set_configureValue(MAGNETIC_SCALE, self._scale)
+        self._set_configureValues({MAGNETIC_OFFSET: self._offset,
+                                   MAGNETIC_SCALE: self._scale})
 
         self._calibrated = True
 
@@ -293,8 +350,8 @@ but {} found".format(type(mode)))
     def clear_calibration(self):
         self._offset = (0, 0, 0)
         self._scale = (1, 1, 1)
-        self._set_configureValue(MAGNETIC_OFFSET, None)
-        self._set_configureValue(MAGNETIC_SCALE, None)
+        self._set_configureValues({MAGNETIC_OFFSET: None,
+                                   MAGNETIC_SCALE: None})
         self._calibrated = False
 
     def heading(self):
@@ -304,85 +361,42 @@ but {} found".format(type(mode)))
         if not self._calibrated:
             self.calibrate()
 
-        ax, ay, az = self._icm20948.acceleration
-        mx, my, mz = self.get_pure_values()
+        axes = self._icm20948.read_all_axes()
+        ax, ay, az = axes[0], axes[1], axes[2]
+        mx, my, mz = self._correct(axes[6:])
 
-        mx = mx
         my = -my
         mz = -mz
 
-        phi = atan(ay/az)
-        psi = atan(-1*ax/(ay*sin(phi)+az*cos(phi)))
-        theta = atan((mz*sin(phi)-my*cos(phi)) /
-                     (mx*cos(psi)+my*sin(psi)*sin(phi)+mz*sin(psi)*cos(phi)))
-        deg = theta * 180 / pi
-        if mx < 0:
-            offset = -90
-        else:
-            offset = +90
-        head = 1 * ((deg+offset) % 360)
-
-        return head
+        # roll and pitch stay within (-90, 90) as with atan(a/b), so a level
+        # board gives phi ~ 0 whichever way its Z axis points
+        phi = atan(ay/az) if az else copysign(pi/2, ay)
+        sp = sin(phi)
+        cp = cos(phi)
+        d = ay*sp + az*cp
+        psi = atan(-ax/d) if d else copysign(pi/2, -ax)
+        sps = sin(psi)
+        cps = cos(psi)
+        theta = atan2(mz*sp - my*cp, mx*cps + my*sps*sp + mz*sps*cp)
+        deg = theta * _RAD2DEG
+
+        # atan2 resolves the heading quadrant, so only the +90 reference
+        # rotation of the former "mx < 0" branch remains
+        return (deg + 90) % 360
 
     def get_field_strength(self):
         raise NotImplementedError
 
     def _get_configureValue(self, key):
-        global CONFIG_FILE
-        try:
-            f = io.open(CONFIG_FILE, mode='r')
-            s = f.read()
-            f.close()
-        except OSError as e:
-            # create new file
-            f = io.open(CONFIG_FILE, mode='w')
-            f.close()
-            f = io.open(CONFIG_FILE, mode='r')
-            s = f.read()
-            f.close()
+        return _load_config().get(key)
 
-        try:
-            j = json.loads(s)
-            return j[key]
-        except OSError as e:
-            pass
-        except ValueError as e:
-            pass
-        except KeyError as e:
-            pass
-
-        return None
-
-    def _set_configureValue(self, key, value):
-        global CONFIG_FILE
-        f = io.open(CONFIG_FILE, mode='r')
-        s = f.read()
-        f.close()
-
-        try:
-            j = json.loads(s)
-        except ValueError as e:
-            j = {}
-
-        try:
-            j[key] = value
-        except TypeError as e:
-            j.update({key, value})
-        s = json.dumps(j)
-
-        f = io.open(CONFIG_FILE, mode='w')
-        f.write(s)
-        f.close()
-
-__lightsensor = None
+    def _set_configureValues(self, values):
+        _load_config().update(values)
+        _flush_config()
 
 
 def get_lightsensor_object():
-    global __lightsensor
-
-    if __lightsensor is None:
-        __lightsensor = __SBLightSensor()
-    return __lightsensor
+    return _get_singleton(__SBLightSensor)
 
 
 class StuduinoBitLightSensor:
@@ -408,17 +422,13 @@ __TEMPERATURENOMINAL__ = const(25)
 __BCOEFFICIENT__ = const(3950)
 # the value of the 'other' resistor
 __SERIESRESISTOR__ = const(10000)
-
-
-__temperature = None
+# 1/To and 1/B of the B parameter equation
+_INV_T0 = 1.0 / (__TEMPERATURENOMINAL__ + 273.15)
+_INV_BCOEFF = 1.0 / __BCOEFFICIENT__
 
 
 def get_temperature_object():
-    global __temperature
-
-    if __temperature is None:
-        __temperature = __SBTemperature()
-    return __temperature
+    return _get_singleton(__SBTemperature)
 
 
 class StuduinoBitTemperature:
@@ -445,17 +455,12 @@ class __SBTemperature:
 
     def get_celsius(self, ndigits=2):
         val = self._pin.read_analog(mv=False)
-        # convert the value to resistance
-        val = 4095 / val - 1
-        val = __SERIESRESISTOR__ * val
-        # print("Thermistor resistance {0}".format(average))
-
-        steinhart = val / __THERMISTORNOMINAL__                 # (R/Ro)
-        steinhart = log(steinhart)                              # ln(R/Ro)
-        steinhart /= __BCOEFFICIENT__                           # 1/B*ln(R/Ro)
-        steinhart += 1.0 / (__TEMPERATURENOMINAL__ + 273.15)    # + (1/To)
-        steinhart = 1.0 / steinhart                             # Invert
-        steinhart -= 273.15                               # convert to C
+        # R/Ro straight from the divider: R = Rs * (4095 / adc - 1), and
+        # __SERIESRESISTOR__ == __THERMISTORNOMINAL__ so Rs/Ro cancels out
+        val = 4095.0 / val - 1.0
+
+        # 1/T = 1/To + 1/B*ln(R/Ro), then convert to C
+        steinhart = 1.0 / (log(val) * _INV_BCOEFF + _INV_T0) - 273.15
         # print("Temperature {0} *C".format(steinhart))
         # steinhart = int(steinhart * pow(10, ndigits)) / pow(10, ndigits)
         steinhart = round(steinhart, ndigits)